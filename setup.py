@@ -1,4 +1,39 @@
-from setuptools import setup, find_packages
+from setuptools import setup, find_packages, Extension
+from setuptools.command.build_ext import build_ext
+from setuptools.errors import CCompilerError, ExecError, PlatformError
+
+
+class optional_build_ext(build_ext):
+    """Builds the extensions when a C compiler is available and skips them otherwise."""
+
+    def run(self):
+        try:
+            super().run()
+        except (PlatformError, OSError) as error:  # No compiler toolchain at all
+            print(f"warning: skipping compiled extensions ({error}); SocketPy will run as plain Python")
+
+    def build_extension(self, ext):
+        try:
+            super().build_extension(ext)
+        except (CCompilerError, ExecError, PlatformError, OSError) as error:
+            print(f"warning: failed to build {ext.name} ({error}); using the pure-Python module instead")
+
+
+try:
+    from Cython.Build import cythonize
+
+    ext_modules = cythonize(
+        [
+            Extension("socketpy._socketpy_fast", ["socketpy/_socketpy_fast.pyx"]),
+            # Compiled in pure-Python mode; the import system prefers the built module over core.py
+            Extension("socketpy.core", ["socketpy/core.py"]),
+        ],
+        language_level=3,
+        # Annotations stay documentation only, so compiled code accepts the same arguments as core.py
+        compiler_directives={"annotation_typing": False},
+    )
+except ImportError:  # Cython is optional, the package runs as plain Python without it
+    ext_modules = []
 
 setup(
     name="SocketPy",
@@ -10,6 +45,8 @@ setup(
     long_description_content_type="text/markdown",
     url="http://localhost:3000/pi/SocketPy",
     packages=find_packages(),
+    ext_modules=ext_modules,
+    cmdclass={"build_ext": optional_build_ext},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -25,4 +62,7 @@ setup(
         "Natural Language :: English"
     ],
     python_requires=">=3.9",
+    extras_require={
+        "fast": ["orjson>=3.6"],
+    },
 )
\ No newline at end of file
@@ -0,0 +1,4 @@
+from .core import SocketPyCore
+from .socket import SocketPy
+
+__all__ = ["SocketPy", "SocketPyCore"]
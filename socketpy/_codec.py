@@ -0,0 +1,29 @@
+"""
+JSON encoding shared by core.py and the compiled helpers. Uses orjson when it is
+installed and falls back to the standard library json module otherwise.
+"""
+from typing import Any, Union
+
+try:
+    import orjson
+
+    # Called as dumps(data, None, options) so the encoder is reached without a Python-level wrapper
+    dumps = orjson.dumps
+    loads = orjson.loads
+    OPTIONS: int = orjson.OPT_NON_STR_KEYS  # Stringify non-str keys as the json module does
+    FRAME_OPTIONS: int = OPTIONS | orjson.OPT_APPEND_NEWLINE  # Newline written by the encoder, no copy
+    JSONDecodeError = orjson.JSONDecodeError
+except ImportError:  # Fall back to the standard library encoder
+    import json
+
+    OPTIONS: int = 0
+    FRAME_OPTIONS: int = 1
+
+    def dumps(data: Any, default: None = None, option: int = OPTIONS) -> bytes:
+        payload = json.dumps(data).encode("utf-8")
+        return payload + b"\n" if option & FRAME_OPTIONS else payload
+
+    def loads(data: Union[bytes, bytearray, memoryview]) -> Any:
+        return json.loads(bytes(data))  # json cannot parse memoryviews directly
+
+    JSONDecodeError = json.JSONDecodeError
@@ -0,0 +1,199 @@
+"""
+ctypes bindings for the Linux sendmmsg() and recvmmsg() system calls, which move many
+UDP datagrams across the kernel boundary in a single call. Only IPv4 addresses are supported.
+"""
+from typing import Callable, List, Optional, Tuple
+import ctypes
+import errno
+import functools
+import math
+import os
+import select
+import socket
+import struct
+import sys
+import time
+
+MSG_WAITFORONE: int = getattr(socket, "MSG_WAITFORONE", 0x10000)
+
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IOVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+SOCKADDR_IN_SIZE: int = 16
+
+available: bool = False
+if sys.platform.startswith("linux"):
+    try:
+        _libc = ctypes.CDLL(None, use_errno=True)
+        _sendmmsg = _libc.sendmmsg
+        _recvmmsg = _libc.recvmmsg
+    except (OSError, AttributeError):
+        pass
+    else:
+        _sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int]
+        _sendmmsg.restype = ctypes.c_int
+        _recvmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+        _recvmmsg.restype = ctypes.c_int
+        available = True
+
+
+def _deadline(timeout: Optional[float]) -> Optional[float]:
+    """Converts a socket timeout to a monotonic deadline, or None when the socket has no timeout."""
+    return time.monotonic() + timeout if timeout else None
+
+
+def _call(call: Callable[[], int], fd: int, events: int, deadline: Optional[float]) -> int:
+    """
+    Runs a system call on fd with the semantics of a Python socket method. A socket with a
+    timeout is non-blocking at the fd level, so when a deadline is given this waits for the
+    fd to become ready first and raises socket.timeout once the deadline passes. Without a
+    deadline the call blocks, or fails with BlockingIOError on a non-blocking socket.
+    """
+    while True:
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            poller = select.poll()
+            poller.register(fd, events)
+            if remaining <= 0 or not poller.poll(math.ceil(remaining * 1000)):
+                raise socket.timeout("timed out")
+        result = call()
+        if result >= 0:
+            return result
+        code = ctypes.get_errno()
+        if code == errno.EINTR or (deadline is not None and code in (errno.EAGAIN, errno.EWOULDBLOCK)):
+            continue
+        raise OSError(code, os.strerror(code))
+
+
+@functools.lru_cache(maxsize=256)
+def sockaddr_in(ip: str, port: int) -> bytes:
+    """
+    Packs an IPv4 address into a raw sockaddr_in structure. Recent destinations
+    are cached, so repeated batches to the same peer skip the packing.
+
+    Args:
+        ip (str): The IPv4 address.
+        port (int): The port number.
+
+    Returns:
+        bytes: The packed sockaddr_in.
+    """
+    return struct.pack("=H", socket.AF_INET) + struct.pack("!H", port) + socket.inet_aton(ip) + bytes(8)
+
+
+def sendmmsg(fd: int, payloads: List[bytes], address: bytes, timeout: Optional[float] = None) -> None:
+    """
+    Sends each payload as its own datagram to a single destination.
+
+    Args:
+        fd (int): The file descriptor of a UDP socket.
+        payloads (List[bytes]): The datagrams to send.
+        address (bytes): The destination as returned by sockaddr_in().
+        timeout (Optional[float]): The socket's timeout, as returned by gettimeout().
+
+    Raises:
+        socket.timeout: If the send buffer stays full until the timeout expires.
+        OSError: If the system call fails.
+    """
+    count = len(payloads)
+    if not count:
+        return
+
+    name = ctypes.create_string_buffer(address, len(address))
+    iovecs = (_IOVec * count)()
+    messages = (_MMsgHdr * count)()
+    pointers = [ctypes.c_char_p(payload) for payload in payloads]  # Keeps payloads pinned for the call
+    for index, payload in enumerate(payloads):
+        iovecs[index].iov_base = ctypes.cast(pointers[index], ctypes.c_void_p)
+        iovecs[index].iov_len = len(payload)
+        header = messages[index].msg_hdr
+        header.msg_name = ctypes.cast(name, ctypes.c_void_p)
+        header.msg_namelen = len(address)
+        header.msg_iov = ctypes.pointer(iovecs[index])
+        header.msg_iovlen = 1
+
+    sent = 0
+    deadline = _deadline(timeout)
+    while sent < count:
+        sent += _call(
+            lambda: _sendmmsg(fd, ctypes.byref(messages[sent]), count - sent, 0), fd, select.POLLOUT, deadline
+        )
+
+
+class Receiver:
+    """
+    Preallocated buffers for receiving up to `count` datagrams of `size` bytes with one recvmmsg() call.
+
+    Attributes:
+        count (int): The maximum number of datagrams received per call.
+        size (int): The size of each datagram buffer.
+    """
+
+    def __init__(self, count: int, size: int) -> None:
+        self.count: int = count
+        self.size: int = size
+        self._buffer: bytearray = bytearray(count * size)
+        self._names = (ctypes.c_char * (count * SOCKADDR_IN_SIZE))()
+        self._iovecs = (_IOVec * count)()
+        self._messages = (_MMsgHdr * count)()
+
+        self._pinned = (ctypes.c_char * len(self._buffer)).from_buffer(self._buffer)  # Locks the buffer in place
+        base = ctypes.addressof(self._pinned)
+        names = ctypes.addressof(self._names)
+        for index in range(count):
+            self._iovecs[index].iov_base = base + index * size
+            self._iovecs[index].iov_len = size
+            header = self._messages[index].msg_hdr
+            header.msg_name = names + index * SOCKADDR_IN_SIZE
+            header.msg_iov = ctypes.pointer(self._iovecs[index])
+            header.msg_iovlen = 1
+
+    def receive(self, fd: int, timeout: Optional[float] = None) -> List[Tuple[memoryview, str]]:
+        """
+        Blocks until at least one datagram arrives, then drains any others already queued.
+
+        Args:
+            fd (int): The file descriptor of a UDP socket.
+            timeout (Optional[float]): The socket's timeout, as returned by gettimeout().
+
+        Returns:
+            List[Tuple[memoryview, str]]: Each datagram's payload and sender IP address.
+            The views are only valid until the next call.
+
+        Raises:
+            socket.timeout: If no datagram arrives before the timeout expires.
+            OSError: If the system call fails.
+        """
+        for index in range(self.count):
+            self._messages[index].msg_hdr.msg_namelen = SOCKADDR_IN_SIZE
+
+        result = _call(
+            lambda: _recvmmsg(fd, self._messages, self.count, MSG_WAITFORONE, None), fd, select.POLLIN, _deadline(timeout)
+        )
+
+        view = memoryview(self._buffer)
+        datagrams = []
+        for index in range(result):
+            offset = index * self.size
+            name = index * SOCKADDR_IN_SIZE
+            ip = socket.inet_ntoa(self._names[name + 4:name + 8])
+            datagrams.append((view[offset:offset + self._messages[index].msg_len], ip))
+        return datagrams
@@ -0,0 +1,53 @@
+# cython: language_level=3
+"""
+Compiled send/receive helpers for SocketPyCore.
+
+These mirror the pure-Python fallbacks in core.py and are picked up
+automatically when the extension has been built.
+"""
+from libc.string cimport memchr
+
+from ._codec import FRAME_OPTIONS as _FRAME_OPTIONS
+from ._codec import dumps as _dumps
+
+
+def fast_send(object sock, object data):
+    """Encodes data as a newline-terminated JSON message and sends it over a connected socket."""
+    cdef bytes payload = _dumps(data, None, _FRAME_OPTIONS)
+    sock.sendall(payload)
+
+
+def fast_recv(object sock, bytearray buffer, bytearray pending, Py_ssize_t limit):
+    """
+    Returns the next newline-delimited message from the stream, receiving into buffer
+    until one is complete, or None if the peer closed the connection.
+    Bytes past the message are left in pending for the next call.
+    Raises OverflowError once a message grows past limit bytes.
+    """
+    cdef Py_ssize_t start = 0
+    cdef Py_ssize_t size
+    cdef Py_ssize_t end
+    cdef char* base
+    cdef void* found
+
+    while True:
+        size = len(pending)
+        if size > start:
+            base = pending
+            found = memchr(base + start, c'\n', size - start)
+            if found != NULL:
+                end = <char*>found - base
+                break
+            start = size
+        if start > limit:
+            raise OverflowError(limit)
+        size = sock.recv_into(buffer)
+        if size == 0:
+            return None
+        pending.extend(memoryview(buffer)[:size])
+
+    if end > limit:
+        raise OverflowError(limit)
+    frame = pending[:end]
+    del pending[:end + 1]
+    return frame
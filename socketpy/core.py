@@ -0,0 +1,664 @@
+from typing import Any, Callable, Collection, Iterable, Iterator, List, Dict, FrozenSet, Optional, Tuple, Union
+import array
+import logging
+import os
+import select
+import socket
+import struct
+import sys
+import threading
+
+from . import _mmsg
+
+from ._codec import JSONDecodeError
+from ._codec import FRAME_OPTIONS as _FRAME_OPTIONS
+from ._codec import OPTIONS as _OPTIONS
+from ._codec import dumps as _dumps
+from ._codec import loads as _loads
+
+try:
+    from ._socketpy_fast import fast_send, fast_recv
+except ImportError:  # Extension not built, use the pure-Python path
+    def fast_send(sock: socket.socket, data: Any) -> None:
+        sock.sendall(_dumps(data, None, _FRAME_OPTIONS))
+
+    def fast_recv(sock: socket.socket, buffer: bytearray, pending: bytearray, limit: int) -> Optional[bytearray]:
+        end = pending.find(b"\n")  # bytearray.find() scans for a single byte with memchr()
+        while end < 0:
+            if len(pending) > limit:
+                raise OverflowError(limit)
+            size = sock.recv_into(buffer)
+            if not size:
+                return None
+            start = len(pending)
+            pending.extend(memoryview(buffer)[:size])
+            end = pending.find(b"\n", start)
+        if end > limit:
+            raise OverflowError(limit)
+        frame = pending[:end]
+        del pending[:end + 1]
+        return frame
+
+logger = logging.getLogger("socketpy")
+
+# Linux busy-polling socket options, not all of which are exposed by the socket module
+SO_BUSY_POLL: int = getattr(socket, "SO_BUSY_POLL", 46)
+SO_PREFER_BUSY_POLL: int = getattr(socket, "SO_PREFER_BUSY_POLL", 69)
+SO_BUSY_POLL_BUDGET: int = getattr(socket, "SO_BUSY_POLL_BUDGET", 70)
+# Privileged variants of SO_SNDBUF/SO_RCVBUF that may exceed net.core.wmem_max/rmem_max
+SO_SNDBUFFORCE: int = getattr(socket, "SO_SNDBUFFORCE", 32)
+SO_RCVBUFFORCE: int = getattr(socket, "SO_RCVBUFFORCE", 33)
+
+ICMP_ECHO_REPLY: int = 0
+ICMP_ECHO_REQUEST: int = 8
+ICMP_HEADER_SIZE: int = 8
+
+def _allowlist(ip: Union[str, Iterable[str]]) -> Collection[str]:
+    """
+    Normalizes an IP filter for membership tests. A single address becomes a one-element
+    tuple so it is matched exactly rather than as a substring; sets, lists and tuples are
+    used as given, and only one-shot iterables are copied into a frozenset.
+    """
+    if isinstance(ip, str):
+        return (ip,)
+    if isinstance(ip, (set, frozenset, list, tuple)):
+        return ip
+    return frozenset(ip)
+
+def _checksum(packet: bytes) -> int:
+    """
+    Computes the Internet checksum (RFC 1071) of a packet. The ones' complement sum
+    is byte-order independent, so words are summed in native order by array() and the
+    result must be packed back in native order.
+    """
+    if len(packet) % 2:
+        packet += b"\x00"
+    total = sum(array.array("H", packet))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+class SocketPyCore:
+    """
+    A socket manager for TCP, UDP, and ICMP protocols.
+    Provides functionality to manage server and client connections.
+
+    Attributes:
+        host (str): The host address.
+        port (int): The port number.
+        protocol (str): The communication protocol (TCP, UDP, or ICMP).
+        busy_poll (int): Busy-polling duration in microseconds, or 0 to disable it.
+        socket_buffer (Optional[int]): Kernel send/receive buffer size in bytes. None sizes UDP buffers to
+            SOCKET_BUFFER_SIZE and leaves TCP to the kernel's autotuning; 0 keeps the system defaults.
+        connections (Tuple[Dict[str, Union[str, socket.socket]], ...]): A read-only snapshot of attached connections.
+        socket (Optional[socket.socket]): The main socket object.
+    """
+
+    MAX_PACKET_SIZE: int = 65535  # Maximum UDP packet size
+    BUFFER_SIZE: int = 4096  # Default buffer size for receiving data
+    MAX_FRAME_SIZE: int = 16 * 1024 * 1024  # Largest newline-delimited TCP message accepted
+    IOV_MAX: int = 1024  # Maximum buffers gathered into a single sendmsg() call
+    BUSY_POLL_BUDGET: int = 64  # Packets processed per busy-poll iteration
+    SOCKET_BUFFER_SIZE: int = 4 * 1024 * 1024  # Default kernel send/receive buffer size for UDP
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        protocol: str = "TCP",
+        busy_poll: int = 0,
+        socket_buffer: Optional[int] = None,
+    ) -> None:
+        self.host: str = host
+        self.port: int = port
+        self.protocol: str = protocol.upper()
+        # Connections are stored column-wise, one slot per attached client
+        self._addrs: List[str] = []
+        self._socks: List[socket.socket] = []
+        self._index: Dict[str, int] = {}  # IP -> slot of its most recent connection
+        self._slots: Dict[socket.socket, int] = {}  # Connection -> slot, for freeing on peer close
+        self._lock: threading.Lock = threading.Lock()  # Guards the slot structures across serving threads
+        self.socket: Optional[socket.socket] = None
+        self._raw: bool = False  # Whether ICMP had to fall back to a raw socket
+        self._icmp_sequence: int = 0
+        self._buf_pool: Dict[int, List[bytearray]] = {}  # Receive buffers reused across calls, by size
+        self._rx_leftover: Dict[socket.socket, bytearray] = {}  # Unparsed TCP stream bytes per connection
+        self._rx_batches: Dict[int, List[_mmsg.Receiver]] = {}  # recvmmsg() buffers reused across calls, by count
+        self._allowed: Optional[FrozenSet[str]] = None  # Default receive filter, see set_allowlist()
+
+        try:
+            if self.protocol == "TCP":
+                self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            elif self.protocol == "UDP":
+                self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            elif self.protocol == "ICMP":
+                try:
+                    # Unprivileged "ping" socket; the kernel fills in the identifier and checksum
+                    self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+                except OSError:
+                    # Not permitted by net.ipv4.ping_group_range, or unsupported on this platform
+                    self.socket = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+                    self._raw = True
+            else:
+                raise ValueError(f"Unsupported protocol: {protocol}")
+
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if self.protocol == "TCP":
+                self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # Flush small messages immediately
+            if socket_buffer is None and self.protocol == "UDP":
+                # A fixed size would disable TCP autotuning, so only UDP gets a default
+                socket_buffer = self.SOCKET_BUFFER_SIZE
+            if socket_buffer and self.protocol in ("TCP", "UDP"):
+                self._size_buffers(socket_buffer)
+            if busy_poll:
+                self._enable_busy_poll(busy_poll)
+        except socket.error as error:
+            raise Exception(f"Failed to initialize socket: {error}")
+
+        # The protocol is fixed for the socket's lifetime, so resolve the hot path once.
+        # Unless a subclass overrides send() or receive(), the specialization is bound on the
+        # instance so calls skip the dispatch frame; overrides reach it through _sender/_receiver.
+        suffix = self.protocol.lower()
+        self._sender: Callable[..., None] = getattr(type(self), "_send_" + suffix)
+        self._receiver: Callable[..., Optional[Dict]] = getattr(type(self), "_receive_" + suffix)
+        if type(self).send is SocketPyCore.send:
+            self.send = getattr(self, "_send_" + suffix)
+        if type(self).receive is SocketPyCore.receive:
+            self.receive = getattr(self, "_receive_" + suffix)
+
+    @property
+    def connections(self) -> Tuple[Dict[str, Union[str, socket.socket]], ...]:
+        """
+        A read-only snapshot of attached connections, one dictionary per client.
+        Use attach() and detach() to change it; the tuple cannot be appended to.
+        """
+        with self._lock:
+            return tuple(
+                {"address": address, "connection": connection, "status": "connected"}
+                for address, connection in zip(self._addrs, self._socks)
+            )
+
+    def set_allowlist(self, ip: Optional[Union[str, Iterable[str]]]) -> None:
+        """
+        Sets the IP addresses that receive() and receive_many() accept data from when
+        no `ip` argument is given. The filter is normalized to a frozenset once here,
+        so a long list costs nothing per call.
+
+        Args:
+            ip (Optional[Union[str, Iterable[str]]]): A string or collection of allowed IP addresses,
+                or None to accept data from any address.
+        """
+        self._allowed = None if ip is None else frozenset(_allowlist(ip))
+
+    def _enable_busy_poll(self, usecs: int) -> None:
+        """
+        Enables NAPI busy polling on the socket so receives spin on the device queue
+        instead of waiting for an interrupt. SO_PREFER_BUSY_POLL (Linux 5.11+) and the
+        poll budget require CAP_NET_ADMIN and are skipped without it.
+
+        Args:
+            usecs (int): How long to busy-poll for before sleeping, in microseconds.
+
+        Raises:
+            ValueError: If busy polling is not supported on this platform.
+        """
+        if not sys.platform.startswith("linux"):
+            raise ValueError("Busy polling is only supported on Linux.")
+
+        self.socket.setsockopt(socket.SOL_SOCKET, SO_BUSY_POLL, usecs)
+        try:
+            self.socket.setsockopt(socket.SOL_SOCKET, SO_PREFER_BUSY_POLL, 1)
+            self.socket.setsockopt(socket.SOL_SOCKET, SO_BUSY_POLL_BUDGET, self.BUSY_POLL_BUDGET)
+        except PermissionError:
+            logger.debug("Preferred busy polling requires CAP_NET_ADMIN; using SO_BUSY_POLL only.")
+
+    def _size_buffers(self, size: int) -> None:
+        """
+        Sets the kernel send and receive buffer sizes. UDP sockets try the privileged
+        SO_SNDBUFFORCE/SO_RCVBUFFORCE options first so the size is not capped by the
+        system maximum, falling back to the regular options without CAP_NET_ADMIN.
+
+        Args:
+            size (int): The buffer size in bytes.
+        """
+        if self.protocol == "UDP" and sys.platform.startswith("linux"):
+            try:
+                self.socket.setsockopt(socket.SOL_SOCKET, SO_SNDBUFFORCE, size)
+                self.socket.setsockopt(socket.SOL_SOCKET, SO_RCVBUFFORCE, size)
+                return
+            except PermissionError:
+                pass
+
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, size)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, size)
+
+    def _acquire_buffer(self, size: int) -> bytearray:
+        """Takes a receive buffer of the given size from the pool, allocating one if none is free."""
+        pool = self._buf_pool.get(size)
+        return pool.pop() if pool else bytearray(size)
+
+    def _release_buffer(self, buffer: bytearray) -> None:
+        """Returns a receive buffer to the pool for reuse."""
+        self._buf_pool.setdefault(len(buffer), []).append(buffer)
+
+    def __enter__(self):
+        """Enter the runtime context related to this object."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Exit the runtime context and clean up the socket."""
+        if self.socket:
+            self.socket.close()
+
+    def send(self, data: Dict, ip: Optional[str] = None, connection: Optional[socket.socket] = None) -> None:
+        """
+        Sends data to a connected socket. TCP messages are terminated by a newline.
+        - Server can send data to a specific client using their IP address.
+        - Client sends data to the connected server.
+
+        Dispatches to _send_tcp(), _send_udp() or _send_icmp() for the socket's protocol.
+        Unless a subclass overrides send(), __init__ binds that method on the instance instead.
+
+        Args:
+            data (Dict): The dictionary to send as JSON.
+            ip (Optional[str]): Target IP address for server-side sending (required for UDP and ICMP).
+            connection (Optional[socket.socket]): The socket object for server-targeted sending.
+
+        Raises:
+            Exception: If the socket or connection fails, or the data is not JSON serializable.
+        """
+        self._sender(self, data, ip, connection)
+
+    def _send_tcp(self, data: Dict, ip: Optional[str] = None, connection: Optional[socket.socket] = None) -> None:
+        """Sends a newline-terminated JSON message over TCP. See send()."""
+        try:
+            if connection:
+                fast_send(connection, data)  # Send to a specific client
+            elif ip:
+                target = self._connection_for(ip)
+                if target is not None:
+                    fast_send(target, data)
+                else:
+                    raise Exception(f"No active connection found for IP: {ip}")
+            else:
+                fast_send(self.socket, data)  # For clients
+            logger.debug("Data sent successfully.")
+        except socket.error as error:
+            raise Exception(f"Failed to send data: {error}")
+        except TypeError as error:  # Unsupported types, and with orjson integers beyond 64 bits
+            raise Exception(f"Data is not JSON serializable: {error}")
+
+    def _send_udp(self, data: Dict, ip: Optional[str] = None, connection: Optional[socket.socket] = None) -> None:
+        """Sends a JSON datagram to the given IP address. See send()."""
+        if ip is None:
+            raise ValueError("IP address is required for UDP communication.")
+
+        try:
+            self.socket.sendto(_dumps(data, None, _OPTIONS), (ip, self.port))
+            logger.debug("Data sent successfully.")
+        except socket.error as error:
+            raise Exception(f"Failed to send data: {error}")
+        except TypeError as error:  # Unsupported types, and with orjson integers beyond 64 bits
+            raise Exception(f"Data is not JSON serializable: {error}")
+
+    def _send_icmp(self, data: Dict, ip: Optional[str] = None, connection: Optional[socket.socket] = None) -> None:
+        """Sends a JSON payload in an ICMP echo request to the given IP address. See send()."""
+        if ip is None:
+            raise ValueError("IP address is required for ICMP communication.")
+
+        # Raw sockets send the header as written, so the identifier and checksum are ours to fill in
+        identifier = os.getpid() & 0xFFFF if self._raw else 0
+        self._icmp_sequence = (self._icmp_sequence + 1) & 0xFFFF
+        packet = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, identifier, self._icmp_sequence)
+
+        try:
+            packet += _dumps(data, None, _OPTIONS)
+            if self._raw:
+                packet = packet[:2] + struct.pack("=H", _checksum(packet)) + packet[4:]
+            self.socket.sendto(packet, (ip, 0))
+            logger.debug("Data sent successfully.")
+        except socket.error as error:
+            raise Exception(f"Failed to send data: {error}")
+        except TypeError as error:  # Unsupported types, and with orjson integers beyond 64 bits
+            raise Exception(f"Data is not JSON serializable: {error}")
+
+    def send_many(self, items: List[Dict], ip: Optional[str] = None, connection: Optional[socket.socket] = None) -> None:
+        """
+        Sends several messages at once, batching them into as few system calls as possible.
+        - TCP messages are gathered into a single sendmsg() call, or joined into one
+          buffer on platforms without sendmsg().
+        - UDP messages are sent as one datagram each to the given IP address,
+          using a single sendmmsg() call where the platform supports it.
+        - ICMP messages are sent as one echo request each to the given IP address.
+
+        Args:
+            items (List[Dict]): The dictionaries to send as JSON.
+            ip (Optional[str]): Target IP address for server-side or UDP sending (optional).
+            connection (Optional[socket.socket]): The socket object for server-targeted sending.
+
+        Raises:
+            Exception: If the socket or connection fails, or the data is not JSON serializable.
+        """
+        if not self.socket:
+            raise Exception("Socket is not initialized.")
+
+        try:
+            if self.protocol == "TCP":
+                buffers = [_dumps(item, None, _FRAME_OPTIONS) for item in items]
+                if connection:
+                    target = connection
+                elif ip:
+                    target = self._connection_for(ip)
+                    if target is None:
+                        raise Exception(f"No active connection found for IP: {ip}")
+                else:
+                    target = self.socket
+                if not hasattr(target, "sendmsg"):  # Windows has no sendmsg(), send one joined buffer
+                    target.sendall(b"".join(buffers))
+                else:
+                    for start in range(0, len(buffers), self.IOV_MAX):
+                        batch = buffers[start:start + self.IOV_MAX]
+                        sent = target.sendmsg(batch)
+                        if sent < sum(map(len, batch)):
+                            target.sendall(b"".join(batch)[sent:])  # Flush a partial write
+            elif self.protocol == "UDP":
+                if ip is None:
+                    raise ValueError("IP address is required for UDP communication.")
+                buffers = [_dumps(item, None, _OPTIONS) for item in items]
+                if _mmsg.available:
+                    _mmsg.sendmmsg(
+                        self.socket.fileno(), buffers, _mmsg.sockaddr_in(ip, self.port), self.socket.gettimeout()
+                    )
+                else:
+                    destination = (ip, self.port)
+                    for buffer in buffers:
+                        self.socket.sendto(buffer, destination)
+            elif self.protocol == "ICMP":
+                for item in items:
+                    self._send_icmp(item, ip)
+            logger.debug("%d messages sent successfully.", len(items))
+        except socket.error as error:
+            raise Exception(f"Failed to send data: {error}")
+        except TypeError as error:  # Unsupported types, and with orjson integers beyond 64 bits
+            raise Exception(f"Data is not JSON serializable: {error}")
+
+    def receive(self, ip: Optional[Union[str, Iterable[str]]] = None, connection: Optional[socket.socket] = None) -> Optional[Dict]:
+        """
+        Receives data from a socket. Filters incoming data by IP address if specified.
+        TCP messages are newline-delimited; bytes past the end of a message are kept
+        and returned by later calls on the same connection.
+
+        Dispatches to _receive_tcp(), _receive_udp() or _receive_icmp() for the socket's protocol.
+        Unless a subclass overrides receive(), __init__ binds that method on the instance instead.
+
+        Args:
+            ip (Optional[Union[str, Iterable[str]]]): A string or collection of allowed IP addresses to receive data from.
+                Defaults to the filter set by set_allowlist(), if any.
+            connection (Optional[socket.socket]): The connection to receive data from (for TCP servers).
+                TCP clients receive from their own socket when this is omitted.
+
+        Returns:
+            Optional[Dict]: The received data as a dictionary, or None if no data was received.
+
+        Raises:
+            Exception: If the socket or connection fails.
+        """
+        return self._receiver(self, ip, connection)
+
+    def _receive_tcp(self, ip: Optional[Union[str, Iterable[str]]] = None, connection: Optional[socket.socket] = None) -> Optional[Dict]:
+        """Receives the next newline-delimited JSON message from a TCP connection. See receive()."""
+        if connection is None:
+            connection = self.socket  # For clients
+
+        try:
+            pending = self._rx_leftover.get(connection)
+            if pending is None:
+                pending = self._rx_leftover[connection] = bytearray()
+            buffer = self._acquire_buffer(self.BUFFER_SIZE)
+            try:
+                frame = fast_recv(connection, buffer, pending, self.MAX_FRAME_SIZE)
+            except OverflowError:
+                # The stream cannot be resynchronised past an unterminated frame, so drop it
+                del self._rx_leftover[connection]
+                raise Exception(f"Received message exceeds {self.MAX_FRAME_SIZE} bytes.")
+            finally:
+                self._release_buffer(buffer)
+            if frame is None:
+                # Peer closed the connection; free its slot but leave closing the socket to its owner
+                del self._rx_leftover[connection]
+                with self._lock:
+                    slot = self._slots.get(connection)
+                    if slot is not None:
+                        self._remove_slot(slot)
+                return None
+            allowed = _allowlist(ip) if ip else self._allowed
+            if allowed is not None or logger.isEnabledFor(logging.DEBUG):
+                # Only look the peer up when it is needed, as it costs a system call per message
+                address = connection.getpeername()[0]
+                if allowed is not None and address not in allowed:
+                    return None
+                logger.debug("Data received from %s.", address)
+            return _loads(frame)
+        except socket.error as error:
+            raise Exception(f"Failed to receive data: {error}")
+        except (JSONDecodeError, ValueError):
+            raise Exception("Received data is not valid JSON.")
+
+    def _receive_udp(self, ip: Optional[Union[str, Iterable[str]]] = None, connection: Optional[socket.socket] = None) -> Optional[Dict]:
+        """Receives a single JSON datagram. See receive()."""
+        buffer = self._acquire_buffer(self.MAX_PACKET_SIZE)
+        try:
+            size, address = self.socket.recvfrom_into(buffer)
+            allowed = _allowlist(ip) if ip else self._allowed
+            if allowed is not None and address[0] not in allowed:
+                return None
+            logger.debug("Data received from %s.", address[0])
+            return _loads(memoryview(buffer)[:size])
+        except socket.error as error:
+            raise Exception(f"Failed to receive data: {error}")
+        except (JSONDecodeError, ValueError):
+            raise Exception("Received data is not valid JSON.")
+        finally:
+            self._release_buffer(buffer)
+
+    def _receive_icmp(self, ip: Optional[Union[str, Iterable[str]]] = None, connection: Optional[socket.socket] = None) -> Optional[Dict]:
+        """Receives the JSON payload of an ICMP echo reply, or None for other ICMP traffic. See receive()."""
+        buffer = self._acquire_buffer(self.MAX_PACKET_SIZE)
+        try:
+            size, address = self.socket.recvfrom_into(buffer)
+            # Raw sockets also deliver the IP header, whose length is in the low nibble of its first byte
+            offset = (buffer[0] & 0x0F) * 4 if self._raw else 0
+            # Only replies count: on loopback a raw socket also sees our own outgoing requests
+            if size < offset + ICMP_HEADER_SIZE or buffer[offset] != ICMP_ECHO_REPLY:
+                return None
+            # Raw sockets see every echo on the host; keep only those carrying our identifier
+            if self._raw and struct.unpack_from("!H", buffer, offset + 4)[0] != os.getpid() & 0xFFFF:
+                return None
+            allowed = _allowlist(ip) if ip else self._allowed
+            if allowed is not None and address[0] not in allowed:
+                return None
+            logger.debug("Data received from %s.", address[0])
+            return _loads(memoryview(buffer)[offset + ICMP_HEADER_SIZE:size])
+        except socket.error as error:
+            raise Exception(f"Failed to receive data: {error}")
+        except (JSONDecodeError, ValueError):
+            raise Exception("Received data is not valid JSON.")
+        finally:
+            self._release_buffer(buffer)
+
+    def receive_many(self, ip: Optional[Union[str, Iterable[str]]] = None, count: int = 16) -> List[Dict]:
+        """
+        Receives a batch of UDP datagrams. Blocks until at least one arrives, then
+        collects up to `count` datagrams that are already queued, using a single
+        recvmmsg() call where the platform supports it. The socket's timeout applies
+        as it does for receive().
+
+        Args:
+            ip (Optional[Union[str, Iterable[str]]]): A string or collection of allowed IP addresses to receive data from.
+                Defaults to the filter set by set_allowlist(), if any.
+            count (int): The maximum number of datagrams to receive.
+
+        Returns:
+            List[Dict]: The received data, one dictionary per accepted datagram.
+
+        Raises:
+            ValueError: If the socket is not a UDP socket.
+            Exception: If the socket fails or times out, or the data is not valid JSON.
+        """
+        if not self.socket:
+            raise Exception("Socket is not initialized.")
+        if self.protocol != "UDP":
+            raise ValueError("Batched receiving is only supported for UDP communication.")
+
+        receiver = None
+        try:
+            if _mmsg.available:
+                # Each call takes its own receiver, since the returned views point into its buffer
+                pool = self._rx_batches.get(count)
+                receiver = pool.pop() if pool else _mmsg.Receiver(count, self.MAX_PACKET_SIZE)
+                datagrams = receiver.receive(self.socket.fileno(), self.socket.gettimeout())
+            else:
+                # The first receive honours the socket's timeout; the rest only drain what is queued
+                data, address = self.socket.recvfrom(self.MAX_PACKET_SIZE)
+                datagrams = [(data, address[0])]
+                flags = getattr(socket, "MSG_DONTWAIT", 0)
+                while len(datagrams) < count and select.select([self.socket], [], [], 0)[0]:
+                    try:
+                        data, address = self.socket.recvfrom(self.MAX_PACKET_SIZE, flags)
+                    except (BlockingIOError, socket.timeout):
+                        break
+                    datagrams.append((data, address[0]))
+
+            allowed = _allowlist(ip) if ip else self._allowed
+            results = []
+            for data, address in datagrams:
+                if allowed is not None and address not in allowed:
+                    continue
+                results.append(_loads(data))
+            logger.debug("%d messages received.", len(results))
+            return results
+        except socket.error as error:
+            raise Exception(f"Failed to receive data: {error}")
+        except (JSONDecodeError, ValueError):
+            raise Exception("Received data is not valid JSON.")
+        finally:
+            if receiver is not None:
+                self._rx_batches.setdefault(count, []).append(receiver)
+
+    def accept(self) -> socket.socket:
+        """
+        Waits for the next incoming TCP connection and registers it with the server.
+        Connections reset by the peer before they could be accepted are skipped.
+
+        Returns:
+            socket.socket: The connected client socket.
+
+        Raises:
+            Exception: If the socket is not initialized or the accept fails.
+        """
+        if not self.socket:
+            raise Exception("Socket is not initialized.")
+
+        while True:
+            try:
+                connection, address = self.socket.accept()
+                break
+            except ConnectionAbortedError:
+                logger.debug("Connection aborted before it was accepted.")
+            except socket.error as error:
+                raise Exception(f"Failed to accept connection: {error}")
+
+        # accept() already reported the peer, which stays valid even if it has since sent a reset
+        self.attach(connection, address[0])
+        logger.info("New connection from %s:%s", address[0], address[1])
+        return connection
+
+    def __iter__(self) -> Iterator[socket.socket]:
+        """Yields incoming TCP connections, each already registered with the server."""
+        while True:
+            yield self.accept()
+
+    def attach(self, connection: socket.socket, ip: Optional[str] = None) -> str:
+        """
+        Registers an accepted client connection with the server.
+
+        Args:
+            connection (socket.socket): The connected client socket.
+            ip (Optional[str]): The peer's IP address, looked up from the connection when omitted.
+
+        Returns:
+            str: The IP address the connection was registered under.
+
+        Raises:
+            Exception: If the peer address cannot be determined. The connection is closed.
+        """
+        if ip is None:
+            try:
+                ip = connection.getpeername()[0]
+            except socket.error as error:
+                connection.close()
+                raise Exception(f"Failed to attach client: {error}")
+
+        with self._lock:
+            self._index[ip] = self._slots[connection] = len(self._addrs)
+            self._addrs.append(ip)
+            self._socks.append(connection)
+        return ip
+
+    def _connection_for(self, ip: str) -> Optional[socket.socket]:
+        """Returns the most recent connection attached from an IP address, if any."""
+        with self._lock:
+            slot = self._index.get(ip)
+            return None if slot is None else self._socks[slot]
+
+    def _remove_slot(self, slot: int) -> None:
+        """Frees a connection slot by moving the last slot into its place. The caller holds _lock."""
+        ip = self._addrs[slot]
+        del self._slots[self._socks[slot]]
+        last = len(self._addrs) - 1
+        if slot != last:
+            moved = self._addrs[slot] = self._addrs[last]
+            connection = self._socks[slot] = self._socks[last]
+            self._slots[connection] = slot
+            if self._index.get(moved) == last:
+                self._index[moved] = slot
+        self._addrs.pop()
+        self._socks.pop()
+
+        if self._index.get(ip) == slot and (slot == last or self._addrs[slot] != ip):
+            # The IP's most recent connection went away; fall back to an older one
+            for index in range(len(self._addrs) - 1, -1, -1):
+                if self._addrs[index] == ip:
+                    self._index[ip] = index
+                    break
+            else:
+                del self._index[ip]
+
+    def detach(self, ip: str) -> None:
+        """
+        Disconnects a client from the server based on its IP address, closing
+        every connection attached from that address.
+
+        Args:
+            ip (str): The IP address of the client to disconnect.
+
+        Raises:
+            Exception: If the IP address is not found in the active connections.
+        """
+        try:
+            closing = []
+            with self._lock:
+                # Close every connection from this IP, not just the most recent one
+                while ip in self._index:
+                    slot = self._index[ip]
+                    closing.append(self._socks[slot])
+                    self._remove_slot(slot)
+            if closing:
+                for connection in closing:
+                    self._rx_leftover.pop(connection, None)
+                    connection.close()
+                logger.info("Disconnected client with IP: %s", ip)
+            else:
+                raise Exception(f"No active connection found for IP: {ip}")
+        except socket.error as error:
+            raise Exception(f"Failed to disconnect client: {error}")
@@ -1,4 +1,5 @@
 from contextlib import contextmanager
+from typing import Optional
 import socket
 import warnings
 from .core import SocketPyCore
@@ -6,7 +7,14 @@ from .core import SocketPyCore
 class SocketPy:
     @classmethod
     @contextmanager
-    def server(cls, host: str, port: int, protocol: str = "TCP") -> SocketPyCore:
+    def server(
+        cls,
+        host: str,
+        port: int,
+        protocol: str = "TCP",
+        busy_poll: int = 0,
+        socket_buffer: Optional[int] = None,
+    ) -> SocketPyCore:
         """
         Context manager for running a server.
 
@@ -14,6 +22,8 @@ class SocketPy:
             host (str): Host address.
             port (int): Port number.
             protocol (str): Communication protocol (default is TCP).
+            busy_poll (int): Busy-polling duration in microseconds (default is 0, disabled).
+            socket_buffer (Optional[int]): Kernel send/receive buffer size in bytes (default is None: 4 MiB for UDP, autotuned for TCP).
 
         Yields:
             SocketPyCore: An instance of the socket manager.
@@ -21,11 +31,11 @@ class SocketPy:
         Raises:
             Exception: If the server fails to start.
         """
-        obj: SocketPyCore = SocketPyCore(host, port, protocol)
+        obj: SocketPyCore = SocketPyCore(host, port, protocol, busy_poll, socket_buffer)
         try:
             obj.socket.bind((host, port))
             if obj.protocol == "TCP":
-                obj.socket.listen(5)
+                obj.socket.listen(socket.SOMAXCONN)
             print(f"Started server at {host}:{port}. Press Ctrl+C to stop it.")
             yield obj
         except socket.error as error:
@@ -36,7 +46,14 @@ class SocketPy:
 
     @classmethod
     @contextmanager
-    def client(cls, host: str, port: int, protocol: str = "TCP") -> SocketPyCore:
+    def client(
+        cls,
+        host: str,
+        port: int,
+        protocol: str = "TCP",
+        busy_poll: int = 0,
+        socket_buffer: Optional[int] = None,
+    ) -> SocketPyCore:
         """
         Context manager for running a client.
 
@@ -44,6 +61,8 @@ class SocketPy:
             host (str): Host address.
             port (int): Port number.
             protocol (str): Communication protocol (default is TCP).
+            busy_poll (int): Busy-polling duration in microseconds (default is 0, disabled).
+            socket_buffer (Optional[int]): Kernel send/receive buffer size in bytes (default is None: 4 MiB for UDP, autotuned for TCP).
 
         Yields:
             SocketPyCore: An instance of the socket manager.
@@ -51,7 +70,7 @@ class SocketPy:
         Raises:
             Exception: If the client fails to connect.
         """
-        obj: SocketPyCore = SocketPyCore(host, port, protocol)
+        obj: SocketPyCore = SocketPyCore(host, port, protocol, busy_poll, socket_buffer)
         try:
             obj.socket.connect((host, port))
             print(f"Connected to server at {host}:{port}.")
@@ -0,0 +1,99 @@
+import logging
+import socket
+
+import pytest
+
+from socketpy.core import SocketPyCore, _allowlist
+
+
+@pytest.fixture
+def udp():
+    server = SocketPyCore("127.0.0.1", 0, "UDP")
+    server.socket.bind(("127.0.0.1", 0))
+    server.socket.settimeout(1.0)
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender.bind(("127.0.0.1", 0))
+
+    def deliver(payload=b'{"ok": true}'):
+        sender.sendto(payload, server.socket.getsockname())
+
+    server.deliver = deliver
+    yield server
+    sender.close()
+    server.socket.close()
+
+
+def test_single_address_is_matched_exactly():
+    assert "127.0.0.1" not in _allowlist("127.0.0.10")
+    assert "127.0.0.1" in _allowlist("127.0.0.1")
+
+
+def test_collections_are_used_as_given():
+    ips = ["127.0.0.1"]
+    assert _allowlist(ips) is ips
+    assert _allowlist(ip for ip in ips) == frozenset(ips)
+
+
+@pytest.mark.parametrize("ip", ["127.0.0.10", ["127.0.0.10"], {"127.0.0.2"}])
+def test_receive_rejects_other_addresses(udp, ip):
+    udp.deliver()
+    assert udp.receive(ip=ip) is None
+
+
+@pytest.mark.parametrize("ip", ["127.0.0.1", ["127.0.0.2", "127.0.0.1"], frozenset({"127.0.0.1"})])
+def test_receive_accepts_listed_addresses(udp, ip):
+    udp.deliver()
+    assert udp.receive(ip=ip) == {"ok": True}
+
+
+def test_set_allowlist_is_the_default_filter(udp):
+    udp.set_allowlist(["127.0.0.10"])
+    udp.deliver()
+    assert udp.receive() is None
+    udp.deliver()
+    assert udp.receive(ip="127.0.0.1") == {"ok": True}  # An explicit filter takes precedence
+
+    udp.deliver()
+    assert udp.receive_many() == []
+
+    udp.set_allowlist(None)
+    udp.deliver()
+    assert udp.receive() == {"ok": True}
+
+
+class CountingSocket:
+    """Wraps a socket and counts getpeername() calls, which the real socket does not allow patching."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.lookups = 0
+
+    def recv_into(self, buffer):
+        return self.connection.recv_into(buffer)
+
+    def getpeername(self):
+        self.lookups += 1
+        return self.connection.getpeername()
+
+
+def test_tcp_peer_lookup_only_when_filtering(caplog):
+    listener = socket.create_server(("127.0.0.1", 0))
+    client = socket.create_connection(listener.getsockname())
+    accepted, _ = listener.accept()
+    manager = SocketPyCore("127.0.0.1", 0)
+    connection = CountingSocket(accepted)
+    try:
+        client.sendall(b'{"n": 1}\n{"n": 2}\n{"n": 3}\n')
+        caplog.set_level(logging.INFO, logger="socketpy")
+        assert manager.receive(connection=connection) == {"n": 1}
+        assert connection.lookups == 0
+
+        assert manager.receive(ip="127.0.0.10", connection=connection) is None
+        assert connection.lookups == 1
+
+        caplog.set_level(logging.DEBUG, logger="socketpy")
+        assert manager.receive(connection=connection) == {"n": 3}
+        assert connection.lookups == 2
+    finally:
+        for sock in (client, accepted, listener, manager.socket):
+            sock.close()
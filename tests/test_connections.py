@@ -0,0 +1,111 @@
+import socket
+
+import pytest
+
+from socketpy.core import SocketPyCore
+
+
+@pytest.fixture
+def server():
+    manager = SocketPyCore("127.0.0.1", 0)
+    manager.socket.bind(("127.0.0.1", 0))
+    manager.socket.listen()
+    clients = []
+
+    def connect(source="127.0.0.1"):
+        client = socket.create_connection(manager.socket.getsockname(), source_address=(source, 0))
+        clients.append(client)
+        return client, manager.accept()
+
+    manager.connect = connect
+    yield manager
+    for client in clients:
+        client.close()
+    for entry in manager.connections:
+        entry["connection"].close()
+    manager.socket.close()
+
+
+def assert_consistent(manager):
+    assert len(manager._addrs) == len(manager._socks) == len(manager._slots)
+    for connection, slot in manager._slots.items():
+        assert manager._socks[slot] is connection
+    for ip, slot in manager._index.items():
+        assert manager._addrs[slot] == ip
+    assert set(manager._index) == set(manager._addrs)
+
+
+def test_connections_is_read_only(server):
+    server.connect()
+    with pytest.raises(AttributeError):
+        server.connections.append({})
+    assert [entry["address"] for entry in server.connections] == ["127.0.0.1"]
+
+
+def test_send_by_ip_targets_most_recent_connection(server):
+    first, _ = server.connect()
+    second, _ = server.connect()
+    server.send({"to": "latest"}, ip="127.0.0.1")
+    assert second.recv(64) == b'{"to":"latest"}\n'
+    first.setblocking(False)
+    with pytest.raises(BlockingIOError):
+        first.recv(64)
+
+
+def test_detach_closes_every_connection_from_ip(server):
+    accepted = [server.connect()[1] for _ in range(3)]
+    _, other = server.connect("127.0.0.2")
+    server.detach("127.0.0.1")
+
+    assert all(connection.fileno() == -1 for connection in accepted)
+    assert [entry["connection"] for entry in server.connections] == [other]
+    assert_consistent(server)
+    with pytest.raises(Exception, match="No active connection"):
+        server.detach("127.0.0.1")
+
+
+def test_peer_close_frees_slot(server):
+    client, accepted = server.connect()
+    _, other = server.connect("127.0.0.2")
+    _, newest = server.connect()
+
+    client.close()
+    assert server.receive(connection=accepted) is None
+    assert accepted.fileno() != -1  # Closing is left to the caller
+    assert {entry["connection"] for entry in server.connections} == {other, newest}
+    assert_consistent(server)
+    accepted.close()
+
+
+def test_slots_stay_consistent_under_churn(server):
+    pairs = [server.connect(source) for source in ("127.0.0.1", "127.0.0.2", "127.0.0.1", "127.0.0.3", "127.0.0.2")]
+    for index in (2, 0, 4):
+        client, accepted = pairs[index]
+        client.close()
+        assert server.receive(connection=accepted) is None
+        accepted.close()
+        assert_consistent(server)
+
+    assert sorted(entry["address"] for entry in server.connections) == ["127.0.0.2", "127.0.0.3"]
+    assert server._index["127.0.0.2"] == server._slots[pairs[1][1]]
+    assert "127.0.0.1" not in server._index
+
+
+def test_index_tracks_recency_not_position(server):
+    first, accepted = server.connect()
+    doomed, doomed_accepted = server.connect("127.0.0.2")
+    server.connect()
+    server.connect("127.0.0.3")
+    first.close()
+    assert server.receive(connection=accepted) is None  # Slots: 127.0.0.3, .2, .1
+    accepted.close()
+
+    newest, _ = server.connect()  # Slots: .3, .2, .1, .1 (newest)
+    doomed.close()
+    assert server.receive(connection=doomed_accepted) is None  # The newest .1 moves below the older one
+    doomed_accepted.close()
+    assert server._addrs == ["127.0.0.3", "127.0.0.1", "127.0.0.1"]
+    assert_consistent(server)
+
+    server.send({"to": "newest"}, ip="127.0.0.1")
+    assert newest.recv(64) == b'{"to":"newest"}\n'
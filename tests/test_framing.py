@@ -0,0 +1,106 @@
+import socket
+
+import pytest
+
+from socketpy import core
+from socketpy.core import SocketPyCore
+
+implementations = [core.fast_recv]
+try:
+    from socketpy._socketpy_fast import fast_recv as compiled_recv
+except ImportError:
+    pass
+else:
+    if compiled_recv is not core.fast_recv:
+        implementations.append(compiled_recv)
+
+
+@pytest.fixture(params=implementations)
+def fast_recv(request):
+    return request.param
+
+
+@pytest.fixture
+def pair():
+    writer, reader = socket.socketpair()
+    yield writer, reader
+    writer.close()
+    reader.close()
+
+
+def test_frame_split_across_reads(fast_recv, pair):
+    writer, reader = pair
+    buffer, pending = bytearray(4), bytearray()
+    writer.sendall(b'{"a": 12345}\n')
+    assert fast_recv(reader, buffer, pending, 1024) == b'{"a": 12345}'
+    assert pending == b""
+
+
+def test_coalesced_frames_leave_leftover(fast_recv, pair):
+    writer, reader = pair
+    buffer, pending = bytearray(64), bytearray()
+    writer.sendall(b"first\nsecond\nthi")
+    assert fast_recv(reader, buffer, pending, 1024) == b"first"
+    assert pending == b"second\nthi"
+    assert fast_recv(reader, buffer, pending, 1024) == b"second"
+    writer.sendall(b"rd\n")
+    assert fast_recv(reader, buffer, pending, 1024) == b"third"
+    assert pending == b""
+
+
+def test_closed_stream_returns_none(fast_recv, pair):
+    writer, reader = pair
+    writer.sendall(b"partial")
+    writer.close()
+    assert fast_recv(reader, bytearray(64), bytearray(), 1024) is None
+
+
+def test_oversized_frame_raises(fast_recv, pair):
+    writer, reader = pair
+    writer.sendall(b"x" * 100)
+    with pytest.raises(OverflowError):
+        fast_recv(reader, bytearray(16), bytearray(), 32)
+
+    writer.sendall(b"y" * 40 + b"\n")
+    with pytest.raises(OverflowError):
+        fast_recv(reader, bytearray(256), bytearray(), 32)
+
+
+@pytest.fixture
+def connection():
+    listener = socket.create_server(("127.0.0.1", 0))
+    client = socket.create_connection(listener.getsockname())
+    server, _ = listener.accept()
+    listener.close()
+    yield client, server
+    client.close()
+    server.close()
+
+
+def test_receive_keeps_leftover_per_connection(connection):
+    client, server = connection
+    manager = SocketPyCore("127.0.0.1", 0)
+    try:
+        client.sendall(b'{"index": 0}\n{"index": 1}\n{"ind')
+        assert manager.receive(connection=server) == {"index": 0}
+        assert manager.receive(connection=server) == {"index": 1}
+        client.sendall(b'ex": 2}\n')
+        assert manager.receive(connection=server) == {"index": 2}
+        client.close()
+        assert manager.receive(connection=server) is None
+        assert server not in manager._rx_leftover
+    finally:
+        manager.socket.close()
+
+
+def test_receive_rejects_oversized_message(connection, monkeypatch):
+    client, server = connection
+    manager = SocketPyCore("127.0.0.1", 0)
+    monkeypatch.setattr(manager, "MAX_FRAME_SIZE", 64)
+    try:
+        client.sendall(b"x" * 256)
+        with pytest.raises(Exception, match="exceeds 64 bytes"):
+            manager.receive(connection=server)
+        assert server not in manager._rx_leftover
+    finally:
+        manager.socket.close()
@@ -0,0 +1,38 @@
+import os
+import struct
+
+import pytest
+
+from socketpy.core import ICMP_ECHO_REQUEST, _checksum
+
+
+def reference_checksum(packet):
+    """RFC 1071 section 4.1, summing big-endian words into a network-order checksum."""
+    if len(packet) % 2:
+        packet += b"\x00"
+    total = sum(struct.unpack(f"!{len(packet) // 2}H", packet))
+    while total >> 16:
+        total = (total >> 16) + (total & 0xFFFF)
+    return ~total & 0xFFFF
+
+
+def with_checksum(packet):
+    return packet[:2] + struct.pack("=H", _checksum(packet)) + packet[4:]
+
+
+def test_rfc_1071_example():
+    # Section 3 of RFC 1071: these words sum to 0xddf2, so the checksum is 0x220d
+    packet = bytes.fromhex("0001f203f4f5f6f7")
+    assert struct.pack("=H", _checksum(packet)) == struct.pack("!H", 0x220D)
+
+
+@pytest.mark.parametrize("size", [0, 1, 7, 64, 1471])
+def test_matches_reference_in_network_order(size):
+    header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, 0x1234, 7)
+    packet = header + os.urandom(size)
+    assert struct.pack("=H", _checksum(packet)) == struct.pack("!H", reference_checksum(packet))
+
+
+def test_completed_packet_verifies():
+    packet = with_checksum(struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, 0xFFFF, 0xFFFF) + b'{"probe":1}')
+    assert _checksum(packet) == 0
@@ -0,0 +1,106 @@
+import ctypes
+import errno
+import socket
+import time
+
+import pytest
+
+from socketpy import _mmsg
+from socketpy.core import SocketPyCore
+
+pytestmark = pytest.mark.skipif(not _mmsg.available, reason="sendmmsg/recvmmsg not available")
+
+
+@pytest.fixture
+def pair():
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    yield sender, receiver
+    sender.close()
+    receiver.close()
+
+
+def test_struct_layouts_match_linux_abi():
+    pointer = ctypes.sizeof(ctypes.c_void_p)
+    assert ctypes.sizeof(_mmsg._IOVec) == 2 * pointer
+    assert ctypes.sizeof(_mmsg._MsgHdr) == 7 * pointer
+    assert ctypes.sizeof(_mmsg._MMsgHdr) == 8 * pointer
+    assert len(_mmsg.sockaddr_in("127.0.0.1", 8080)) == _mmsg.SOCKADDR_IN_SIZE
+
+
+def test_round_trip(pair):
+    sender, receiver = pair
+    payloads = [f"datagram {index}".encode() for index in range(5)]
+    _mmsg.sendmmsg(sender.fileno(), payloads, _mmsg.sockaddr_in(*receiver.getsockname()))
+
+    datagrams = _mmsg.Receiver(8, 2048).receive(receiver.fileno())
+    assert [bytes(view) for view, _ in datagrams] == payloads
+    assert {ip for _, ip in datagrams} == {"127.0.0.1"}
+
+
+def test_partial_sendmmsg_is_resumed(pair, monkeypatch):
+    sender, receiver = pair
+    send = _mmsg._sendmmsg
+    calls = []
+
+    def send_two(fd, messages, count, flags):
+        calls.append(count)
+        return send(fd, messages, min(count, 2), flags)
+
+    monkeypatch.setattr(_mmsg, "_sendmmsg", send_two)
+    payloads = [bytes([index]) * (index + 1) for index in range(5)]
+    _mmsg.sendmmsg(sender.fileno(), payloads, _mmsg.sockaddr_in(*receiver.getsockname()))
+
+    assert calls == [5, 3, 1]
+    datagrams = _mmsg.Receiver(8, 64).receive(receiver.fileno())
+    assert [bytes(view) for view, _ in datagrams] == payloads
+
+
+def test_send_many_and_receive_many():
+    server = SocketPyCore("127.0.0.1", 0, "UDP")
+    server.socket.bind(("127.0.0.1", 0))
+    client = SocketPyCore("127.0.0.1", server.socket.getsockname()[1], "UDP")
+    try:
+        client.send_many([{"index": index} for index in range(20)], ip="127.0.0.1")
+        assert server.receive_many(count=8) == [{"index": index} for index in range(8)]
+        assert server.receive_many(count=16) == [{"index": index} for index in range(8, 20)]
+    finally:
+        client.socket.close()
+        server.socket.close()
+
+
+@pytest.mark.parametrize("batched", [True, False], ids=["recvmmsg", "recvfrom"])
+def test_receive_many_honours_timeout(batched, monkeypatch):
+    monkeypatch.setattr(_mmsg, "available", batched)
+    server = SocketPyCore("127.0.0.1", 0, "UDP")
+    server.socket.bind(("127.0.0.1", 0))
+    server.socket.settimeout(0.2)
+    try:
+        started = time.monotonic()
+        with pytest.raises(Exception, match="timed out"):
+            server.receive_many()
+        assert time.monotonic() - started >= 0.15
+
+        server.socket.setblocking(False)
+        with pytest.raises(Exception, match="temporarily unavailable"):
+            server.receive_many()
+    finally:
+        server.socket.close()
+
+
+def test_sendmmsg_waits_for_send_buffer(pair, monkeypatch):
+    sender, receiver = pair
+    send = _mmsg._sendmmsg
+    results = [-1]
+
+    def busy_once(fd, messages, count, flags):
+        if results:
+            results.pop()
+            ctypes.set_errno(errno.EAGAIN)
+            return -1
+        return send(fd, messages, count, flags)
+
+    monkeypatch.setattr(_mmsg, "_sendmmsg", busy_once)
+    _mmsg.sendmmsg(sender.fileno(), [b"datagram"], _mmsg.sockaddr_in(*receiver.getsockname()), 1.0)
+    assert receiver.recv(64) == b"datagram"
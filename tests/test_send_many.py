@@ -0,0 +1,81 @@
+import socket
+
+import pytest
+
+from socketpy.core import SocketPyCore
+
+
+@pytest.fixture
+def connection():
+    listener = socket.create_server(("127.0.0.1", 0))
+    client = socket.create_connection(listener.getsockname())
+    server, _ = listener.accept()
+    listener.close()
+    manager = SocketPyCore("127.0.0.1", 0)
+    yield manager, client, server
+    for sock in (client, server, manager.socket):
+        sock.close()
+
+
+def receive_all(manager, server, count):
+    return [manager.receive(connection=server) for _ in range(count)]
+
+
+class PartialSocket:
+    """Accepts at most `limit` bytes per sendmsg() call, as a full send buffer would."""
+
+    def __init__(self, connection, limit):
+        self.connection = connection
+        self.limit = limit
+        self.calls = 0
+
+    def sendmsg(self, buffers):
+        self.calls += 1
+        data = b"".join(buffers)[:self.limit]
+        self.connection.sendall(data)
+        return len(data)
+
+    def sendall(self, data):
+        self.connection.sendall(data)
+
+
+class NoSendmsgSocket:
+    """A socket without sendmsg(), as on Windows."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def sendall(self, data):
+        self.connection.sendall(data)
+
+
+def test_frames_cross_iov_max_boundary(connection):
+    manager, client, server = connection
+    items = [{"index": index, "pad": "x" * (index % 7)} for index in range(SocketPyCore.IOV_MAX + 5)]
+    manager.send_many(items, connection=client)
+    assert receive_all(manager, server, len(items)) == items
+
+
+def test_batches_are_split_at_iov_max(connection, monkeypatch):
+    manager, client, server = connection
+    monkeypatch.setattr(manager, "IOV_MAX", 3)
+    target = PartialSocket(client, 1 << 20)
+    items = [{"index": index} for index in range(10)]
+    manager.send_many(items, connection=target)
+    assert target.calls == 4
+    assert receive_all(manager, server, len(items)) == items
+
+
+def test_partial_write_is_flushed(connection):
+    manager, client, server = connection
+    target = PartialSocket(client, 5)
+    items = [{"index": index} for index in range(4)]
+    manager.send_many(items, connection=target)
+    assert receive_all(manager, server, len(items)) == items
+
+
+def test_without_sendmsg_frames_are_joined(connection):
+    manager, client, server = connection
+    items = [{"index": index} for index in range(4)]
+    manager.send_many(items, connection=NoSendmsgSocket(client))
+    assert receive_all(manager, server, len(items)) == items